@@ -124,25 +124,35 @@ quantity = Quantity
 
 
 class Pointer:
+    """ Mutable reference to another object, e.g., ``CONFIG_INI``, such that it can be imported before being assigned.
+
+        All attribute access, including, e.g., ``__class__``, is forwarded to the referent, except for ``self`` (the
+        referent itself), ``point_to``, and those needed to pickle the pointer itself.
+    """
+    __slots__ = ("ref",)
+    _own_attributes = frozenset(("point_to", "__reduce__", "__reduce_ex__"))
+
     def __init__(self, ref):
-        super().__getattribute__("point_to")(ref)
+        self.point_to(ref)
 
     def __getattribute__(self, name):
         if name == "self":
-            return super().__getattribute__("ref")
-        elif name == "point_to":
-            return super().__getattribute__(name)
-        else:
-            return super().__getattribute__("ref").__getattribute__(name)
+            return object.__getattribute__(self, "ref")
+        elif name in Pointer._own_attributes:
+            return object.__getattribute__(self, name)
+        return getattr(object.__getattribute__(self, "ref"), name)
 
     def __setattr__(self, name, value):
-        super().__getattribute__("ref").__setattr__(name, value)
+        setattr(object.__getattribute__(self, "ref"), name, value)
 
     def __delattr__(self, name):
-        super().__getattribute__("ref").__delattr__(name)
+        delattr(object.__getattribute__(self, "ref"), name)
+
+    def __dir__(self):
+        return dir(object.__getattribute__(self, "ref"))
 
-    def __dir__(self, name):
-        super().__getattribute__("ref").__dir__(name)
+    def __reduce__(self):
+        return Pointer, (object.__getattribute__(self, "ref"),)
 
     def point_to(self, ref):
-        super().__setattr__("ref", ref)
+        object.__setattr__(self, "ref", ref)
@@ -8,6 +8,8 @@ import logging
 import os
 import struct
 
+import pyvisa
+
 from catkit.hardware.npoint.nPointTipTiltController import Commands, Parameters, NPointLC400
 from catkit.interfaces.Instrument import SimInstrument
 
@@ -25,6 +27,9 @@ class PyvisaNpointEmulator:
 
     config_params = ('< SIMULATED CONFIGUARTION 1: 0 mA>',)
 
+    # Length in bytes of each message type, used to split concatenated messages.
+    message_lengths = {Commands.SET: 10, Commands.SECOND_MSG: 6, Commands.GET_SINGLE: 6, Commands.GET_ARRAY: 10}
+
     def __init__(self):
         """ Since we'll need to respond as if commands are being sent and we
         can read values, this is where we'll initialize some value stores that
@@ -51,12 +56,28 @@ class PyvisaNpointEmulator:
         self.initialize()
 
     def read_bytes(self, byte_count):
-        """ On hardware, reads single message from device. In simulation, pulls most recent message that expected a response. """
-        return self.response_message.pop()[:byte_count]
+        """ On hardware, reads single message from device. In simulation, pulls the oldest pending response, i.e.,
+        responses are returned in the order their requests were written (assumed, not verified, to match hardware). """
+        return self.response_message.pop(0)[:byte_count]
+
+    def flush(self, mask):
+        """ On hardware, flushes/discards the specified buffers. In simulation, discards any pending responses. """
+        if mask & pyvisa.constants.BufferOperation.discard_read_buffer:
+            self.response_message.clear()
 
     def write_raw(self, message):
-        """ On hardware, writes a single message from device. In simulation,
-        updates logical stored values. """
+        """ On hardware, writes message(s) to the device. In simulation, splits the byte stream into its individual
+        messages and processes each in turn. """
+        while message:
+            try:
+                message_length = self.message_lengths[Commands(message[:1])]
+            except ValueError as error:
+                raise NotImplementedError('Non implemented command found in message.') from error
+            self._write_message(message[:message_length])
+            message = message[message_length:]
+
+    def _write_message(self, message):
+        """ Updates logical stored values for a single message. """
         endian = NPointLC400.endian
 
         self.message = message
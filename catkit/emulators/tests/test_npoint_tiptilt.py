@@ -3,6 +3,7 @@ import itertools
 import os
 import struct
 
+import numpy as np
 import pytest
 
 from catkit.hardware.npoint.nPointTipTiltController import Commands, Parameters, NPointLC400
@@ -24,6 +25,26 @@ def test_get_status():
             controller.get_status(channel)
 
 
+def test_get_status_order():
+    values = {Parameters.LOOP: 1, Parameters.P_GAIN: 0.5, Parameters.I_GAIN: 0.25, Parameters.D_GAIN: 0.125}
+    with Controller() as controller:
+        for channel in controller.channels:
+            for parameter, value in values.items():
+                controller.set(parameter, channel, value)
+            assert controller.get_status(channel) == values
+
+
+def test_get_status_out_of_sync_recovery():
+    with Controller() as controller:
+        # Leave a stale response pending such that get_status() reads it first and raises.
+        controller._send(controller._build_get_message(Parameters.P_GAIN, 2))
+        with pytest.raises(RuntimeError):
+            controller.get_status(1)
+        # The remaining responses were discarded, so subsequent reads are back in sync.
+        assert not controller.instrument.response_message
+        assert controller.get(Parameters.LOOP, 1) == 0
+
+
 @pytest.mark.parametrize(("parameter", "channel", "value"),
                          itertools.product([param for param in Parameters],
                                            [channel for channel in NPointLC400.channels],
@@ -34,6 +55,17 @@ def test_set(parameter, channel, value):
         assert value == controller.instrument_lib.value_store[channel][parameter]
 
 
+@pytest.mark.parametrize("value", (np.int64(1), np.float32(0.5)))
+def test_set_numpy_scalar(value):
+    with Controller() as controller:
+        controller.set(Parameters.P_GAIN, 1, value)
+        assert controller.instrument_lib.value_store[1][Parameters.P_GAIN] == value
+
+    with pytest.raises(TypeError):
+        with Controller() as controller:
+            controller.set(Parameters.P_GAIN, 1, "0.5")
+
+
 @pytest.mark.parametrize(("parameter", "channel"),
                          itertools.product([param for param in Parameters],
                                            [channel for channel in NPointLC400.channels]))
@@ -74,3 +106,20 @@ def test_message_parser(command, parameter, channel, value):
     assert parsed_address == address
     assert parsed_channel == channel
     assert parsed_value == value
+
+
+def test_close_resets_all_parameters():
+    controller = Controller()
+    controller._open()
+    for channel in controller.channels:
+        for parameter in Parameters:
+            controller.set(parameter, channel, 1)
+
+    writes = []
+    write_raw = controller.instrument.write_raw
+    controller.instrument.write_raw = lambda message: writes.append(message) or write_raw(message)
+    value_store = controller.instrument.value_store
+    controller._close()
+
+    assert len(writes) == 1
+    assert all(value == 0 for channel in value_store.values() for value in channel.values())
@@ -0,0 +1,80 @@
+import os
+from unittest import mock
+
+import pytest
+
+from catkit.hardware.iris_ao import util
+from catkit.hardware.iris_ao.segmented_dm_command import SegmentedDmCommand
+
+
+DM_CONFIG_ID = "iris_ao"
+
+
+@pytest.mark.usefixtures("dummy_config_ini")
+def test_update_segments_add():
+    command = SegmentedDmCommand(DM_CONFIG_ID)
+    command.update_segments([1, 3], [(0, 2, 0), (1, 0, 0)])
+    command.update_segments([1, 1], [(1, 0, 0), (1, 1, 0)])  # Repeated indices are summed.
+
+    data = command.get_data()
+    assert data[1] == (2, 3, 0)
+    assert data[3] == (1, 0, 0)
+    assert data[0] == (0, 0, 0)
+
+
+@pytest.mark.usefixtures("dummy_config_ini")
+def test_update_segments_replace():
+    command = SegmentedDmCommand(DM_CONFIG_ID)
+    command.update_segments([1, 2], [(1, 1, 1), (2, 2, 2)])
+    command.update_segments([1, 1], [(5, 0, 0), (7, 0, 0)], add_to_current=False)  # Last one wins.
+
+    data = command.get_data()
+    assert data[1] == (7, 0, 0)
+    assert data[2] == (2, 2, 2)
+
+
+@pytest.mark.usefixtures("dummy_config_ini")
+@pytest.mark.parametrize("add_to_current", (True, False))
+def test_update_one_segment(add_to_current):
+    command = SegmentedDmCommand(DM_CONFIG_ID)
+    expected = SegmentedDmCommand(DM_CONFIG_ID)
+    for segment_command in (command, expected):
+        segment_command.read_initial_command([(1, 0, 0)] * segment_command.aperture.number_segments_in_pupil)
+
+    command.update_one_segment(4, (1, 2, 3), add_to_current=add_to_current)
+    command.update_one_segment(4, (1, 2, 3), add_to_current=add_to_current)
+    expected.update_segments([4, 4], [(1, 2, 3)] * 2, add_to_current=add_to_current)
+
+    assert command.get_data() == expected.get_data()
+    assert command.get_data()[4] == ((3, 4, 6) if add_to_current else (1, 2, 3))
+
+
+def write_flat(path, piston):
+    flat = dict(zip(util.iris_pupil_naming(DM_CONFIG_ID), [(piston, 0, 0)] * util.iris_num_segments(DM_CONFIG_ID)))
+    util.write_ini(flat, path, dm_config_id=DM_CONFIG_ID)
+    return path
+
+
+@pytest.mark.usefixtures("dummy_config_ini")
+def test_flat_map_caching(tmpdir):
+    flat_1 = write_flat(os.path.join(tmpdir, "flat_1.ini"), 1)
+    flat_2 = write_flat(os.path.join(tmpdir, "flat_2.ini"), 2)
+
+    command = SegmentedDmCommand(DM_CONFIG_ID, apply_flat_map=True, filename_flat=flat_1)
+    with mock.patch.object(util, "read_ini", wraps=util.read_ini) as read_ini:
+        # Read once.
+        assert command.to_command() == command.to_command()
+        assert read_ini.call_count == 1
+        assert all(ptt == (1, 0, 0) for ptt in command.to_command().values())
+
+        # Re-read when the filename changes.
+        command.filename_flat = flat_2
+        assert all(ptt == (2, 0, 0) for ptt in command.to_command().values())
+        assert read_ini.call_count == 2
+
+        # Re-read when the file is modified.
+        write_flat(flat_2, 3)
+        stat = os.stat(flat_2)
+        os.utime(flat_2, (stat.st_atime, stat.st_mtime + 1))
+        assert all(ptt == (3, 0, 0) for ptt in command.to_command().values())
+        assert read_ini.call_count == 3
@@ -15,6 +15,8 @@ m_per_volt_map2 = None  # for caching the conversion factor, to avoid reading fr
 flat_map_dm1 = None  # for caching the conversion factor, to avoid reading from disk each time
 flat_map_dm2 = None  # for caching the conversion factor, to avoid reading from disk each time
 
+actuator_mask = None  # for caching the boolean DM mask, to avoid recasting it on each command conversion
+
 class DmCommand(object):
     def __init__(self, data, dm_num, flat_map=False, bias=False, as_voltage_percentage=False,
                  as_volts=False, sin_specification=None):
@@ -35,10 +37,6 @@ class DmCommand(object):
 
         """
 
-        calibration_data_package = CONFIG_INI.get("optics_lab", "calibration_data_package")
-        self.calibration_data_path = os.path.join(catkit.util.find_package_location(calibration_data_package),
-                                                  "hardware",
-                                                  "boston")
         self.dm_num = dm_num
         self.flat_map = flat_map
         self.bias = bias
@@ -82,6 +80,10 @@ class DmCommand(object):
             raise ValueError("Data needs to be a 1D array of size " + str(self.total_actuators) + " or " +
                              "a 2D array of size " + str(self.pupil_length) + "," + str(self.pupil_length))
 
+    @property
+    def calibration_data_path(self):
+        return get_calibration_data_path()
+
     def get_data(self):
         return self.data
 
@@ -156,10 +158,11 @@ class DmCommand(object):
         dir_path = os.path.join(path, folder_name)
 
         # Save 1D representation of the command with no padding (1 x 952).
-        dm_command_1d = self.to_dm_command()[0:self.total_actuators] if self.dm_num == 1 \
-            else self.to_dm_command()[1024:1024 + self.total_actuators]
+        dm_command = self.to_dm_command()
+        dm_command_1d = dm_command[0:self.total_actuators] if self.dm_num == 1 \
+            else dm_command[1024:1024 + self.total_actuators]
 
-        catkit.util.write_fits(self.to_dm_command(), os.path.join(dir_path, "dm{}_command_1d".format(self.dm_num)))
+        catkit.util.write_fits(dm_command, os.path.join(dir_path, "dm{}_command_1d".format(self.dm_num)))
 
         # Save 2D representation of the command with no padding (34 x 34).
         catkit.util.write_fits(convert_dm_command_to_image(dm_command_1d),
@@ -181,30 +184,35 @@ def load_dm_command(path, dm_num=1, flat_map=False, bias=False, as_volts=False):
     return DmCommand(data, dm_num, flat_map=flat_map, bias=bias, as_volts=as_volts)
 
 
+def get_calibration_data_path():
+    """
+    Get the directory holding the Boston DM calibration files (flat and gain maps).
+    This is only needed when loading those files, which are then cached, so it is resolved lazily rather than
+    upon every DmCommand instantiation.
+    """
+    calibration_data_package = CONFIG_INI.get("optics_lab", "calibration_data_package")
+    return os.path.join(catkit.util.find_package_location(calibration_data_package), "hardware", "boston")
+
+
 def get_flat_map_volts(dm_num):
     """
     Get the flat map for a given dm. The flat map is in volts for each actuator.
     :param dm_num: Which DM to lead the command for.
     :return: flat map for the selected DM. This function caches the map to avoid multiple disk access.
     """
-    calibration_data_package = CONFIG_INI.get("optics_lab", "calibration_data_package")
-    calibration_data_path = os.path.join(catkit.util.find_package_location(calibration_data_package),
-                                         "hardware",
-                                         "boston")
-
     global flat_map_dm1, flat_map_dm2
 
     if dm_num == 1:
         if flat_map_dm1 is None:
             fname = CONFIG_INI.get("boston_kilo952", "flat_map_dm1")
-            flat_map_dm1 = fits.getdata(os.path.join(calibration_data_path, fname))
+            flat_map_dm1 = fits.getdata(os.path.join(get_calibration_data_path(), fname))
 
         return flat_map_dm1
 
     if dm_num == 2:
         if flat_map_dm2 is None:
             fname = CONFIG_INI.get("boston_kilo952", "flat_map_dm2")
-            flat_map_dm2 = fits.getdata(os.path.join(calibration_data_path, fname))
+            flat_map_dm2 = fits.getdata(os.path.join(get_calibration_data_path(), fname))
 
         return flat_map_dm2
 
@@ -217,24 +225,19 @@ def get_m_per_volt_map(dm_num):
     :param dm_num: Which DM to load the command for.
     :return: gain map for the selected DM. This function caches the map to avoid multiple disk access
     """
-    calibration_data_package = CONFIG_INI.get("optics_lab", "calibration_data_package")
-    calibration_data_path = os.path.join(catkit.util.find_package_location(calibration_data_package),
-                                         "hardware",
-                                         "boston")
-
     global m_per_volt_map1, m_per_volt_map2
 
     if dm_num == 1:
         if m_per_volt_map1 is None:
             fname = CONFIG_INI.get("boston_kilo952", "gain_map_dm1")
-            m_per_volt_map1 = fits.getdata(os.path.join(calibration_data_path, fname))
+            m_per_volt_map1 = fits.getdata(os.path.join(get_calibration_data_path(), fname))
 
         return m_per_volt_map1
 
     if dm_num == 2:
         if m_per_volt_map2 is None:
             fname = CONFIG_INI.get("boston_kilo952", "gain_map_dm2")
-            m_per_volt_map2 = fits.getdata(os.path.join(calibration_data_path, fname))
+            m_per_volt_map2 = fits.getdata(os.path.join(get_calibration_data_path(), fname))
 
         return m_per_volt_map2
 
@@ -279,8 +282,28 @@ def convert_m_to_volts(data, dm_num, meter_to_volt_map=None):
     return catkit.util.safe_divide(data, meter_to_volt_map)
 
 
+def get_actuator_mask():
+    """
+    Get the DM mask as a boolean array, True for each of the actuators.
+    :return: 2D boolean mask. This function caches the mask to avoid recasting it for every command conversion.
+             The returned array is shared by all callers and is therefore read-only, copy it if it needs to be modified.
+    """
+    global actuator_mask
+
+    if actuator_mask is None:
+        actuator_mask = catkit.util.get_dm_mask().astype(bool)
+        actuator_mask.flags.writeable = False
+
+    return actuator_mask
+
+
 def convert_dm_command_to_image(dm_command):
-    mask = catkit.util.get_dm_mask().astype('bool')
+    """
+    Scatter a 1D DM command onto the 2D DM grid.
+    :param dm_command: 1D array of actuator values, only the first number_of_actuators values are used.
+    :return: 2D image of the DM command.
+    """
+    mask = get_actuator_mask()
     number_of_actuators = np.count_nonzero(mask)
 
     image = np.zeros(mask.shape)
@@ -291,7 +314,7 @@ def convert_dm_command_to_image(dm_command):
 
 def convert_dm_image_to_command(dm_image, path_to_save=None):
     # Take actuators corresponding to the DM mask
-    dm_command = dm_image[catkit.util.get_dm_mask().astype('bool')]
+    dm_command = dm_image[get_actuator_mask()]
 
     # Write new image as fits file
     if path_to_save is not None:
@@ -43,7 +43,7 @@ def poke_command(actuators, amplitude=quantity(700, units.nanometer), bias=False
                  flat_map=True, return_shortname=False, dm_num=1):
     """
     Creates a DmCommand object that pokes actuators at a given amplitude.
-    :param actuators: List of actuators, or a single actuator.
+    :param actuators: List, tuple, or array of actuators, or a single actuator.
     :param amplitude: Nanometers of amplitude
     :param bias: Boolean flag for whether to apply a bias.
     :param flat_map: Boolean flag for whether to apply a flat_map.
@@ -65,10 +65,10 @@ def poke_command(actuators, amplitude=quantity(700, units.nanometer), bias=False
     if bias:
         short_name += "_bias"
 
-    if isinstance(actuators, list):
-        for actuator in actuators:
-            poke_array[actuator] = amplitude
-            short_name += "_" + str(actuator)
+    if isinstance(actuators, (list, tuple, np.ndarray)):
+        # Fancy index in one go so that module level constant tuples/arrays of actuators can be passed as is.
+        poke_array[np.asarray(actuators, dtype=int)] = amplitude
+        short_name += "".join("_" + str(actuator) for actuator in actuators)
     else:
         short_name += "_" + str(actuators)
         poke_array[actuators] = amplitude
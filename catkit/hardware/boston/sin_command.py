@@ -1,8 +1,7 @@
+import functools
 import math
 
 import numpy as np
-from scipy.ndimage.interpolation import rotate
-from skimage.transform import resize
 
 import catkit.util
 from catkit.hardware.boston.DmCommand import DmCommand
@@ -84,6 +83,10 @@ def __sin_wave_aj_matlab(rotate_deg, ncycles, amplitude_factor):
     """
     Depricated - This function creates an imperfect sine wave due to numpy resize and rotate. Use __sin_wave().
     """
+    # Only this deprecated function needs these, so don't pay for importing them with the module.
+    from scipy.ndimage.interpolation import rotate
+    from skimage.transform import resize
+
     fl6 = CONFIG_INI.getfloat('optical_design', 'focal_length6')
     fl7 = CONFIG_INI.getfloat('optical_design', 'focal_length7')
 
@@ -109,6 +112,26 @@ def __sin_wave_aj_matlab(rotate_deg, ncycles, amplitude_factor):
     return sin_wave_v
 
 
+@functools.lru_cache(maxsize=8)
+def __actuator_grid(num_actuators_pupil):
+    """
+    Create the 2D grid of actuator coordinates, spanning [-0.5, 0.5) and centered on each actuator, used by
+    __sin_wave(). This only depends on the DM size so is computed once and cached. The arrays are read-only.
+    :param num_actuators_pupil: Number of actuators across the pupil.
+    :return: Tuple of 2D numpy arrays, (x_mesh, y_mesh).
+    """
+
+    # Make a linear ramp.
+    linear_ramp = np.linspace(-0.5, 0.5, num=num_actuators_pupil, endpoint=False)
+    linear_ramp += 0.5/num_actuators_pupil
+
+    # Create a 2D ramp.
+    x_mesh, y_mesh = np.meshgrid(linear_ramp, linear_ramp)
+    x_mesh.flags.writeable = False
+    y_mesh.flags.writeable = False
+    return x_mesh, y_mesh
+
+
 def __sin_wave(rotate_deg, ncycles, peak_to_valley, phase):
     """
     Mathematical function to create a 2D sine wave the size of the HiCAT pupil.
@@ -119,22 +142,19 @@ def __sin_wave(rotate_deg, ncycles, peak_to_valley, phase):
     :return: 2D numpy array sized by the "dm_length_actuators" parameter in config.ini file.
     """
 
-    # Make a linear ramp.
+    # Get the (cached) 2D ramp.
     num_actuators_pupil = CONFIG_INI.getint(dm_config_id, 'dm_length_actuators')
-    linear_ramp = np.linspace(-0.5, 0.5, num=num_actuators_pupil, endpoint=False)
-    linear_ramp += 0.5/num_actuators_pupil
+    x_mesh, y_mesh = __actuator_grid(num_actuators_pupil)
 
     # Convert to radians.
     phase_rad = np.deg2rad(phase)
     theta_rad = np.deg2rad(rotate_deg)
 
-    # Create a 2D ramp.
-    x_mesh, y_mesh = np.meshgrid(linear_ramp, linear_ramp)
-
-    # Put the ramps through sine.
-    xt = x_mesh * np.cos(theta_rad)
-    yt = y_mesh * np.sin(theta_rad)
-    xyt = xt + yt
-    xyf = xyt * float(ncycles) * 2.0 * np.pi
-    sine_wave = (float(peak_to_valley.to_base_units().m) / 2.0) * np.cos(xyf + phase_rad)
+    # Put the ramps through sine, operating in-place on a single output array to avoid creating temporaries.
+    sine_wave = x_mesh * np.cos(theta_rad)
+    sine_wave += y_mesh * np.sin(theta_rad)
+    sine_wave *= float(ncycles) * 2.0 * np.pi
+    sine_wave += phase_rad
+    np.cos(sine_wave, out=sine_wave)
+    sine_wave *= float(peak_to_valley.to_base_units().m) / 2.0
     return sine_wave
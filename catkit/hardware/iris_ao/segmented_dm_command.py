@@ -15,7 +15,7 @@ Note that a command can be initialized from zeros, None, a list of tuples giving
 an .ini file, or a .PTT### file. The PoppySegmentedDmCommand class can be used to create a command from
 input Zernike coefficients.
 Additionally, a single segment can be changed using the SegmentedDmCommand.update_one_segment()
-method.
+method, or several at once using the SegmentedDmCommand.update_segments() method.
 
 """
 from configparser import NoOptionError
@@ -223,6 +223,7 @@ class SegmentedDmCommand(object):
 
         # Determine if the custom flat map will be applied
         self.apply_flat_map = apply_flat_map
+        self._flat_map_cache = None  # ((filename_flat, mtime), data) read upon first use by to_command().
         if self.apply_flat_map:
             if filename_flat is None:
                 raise ValueError("Must provide a filename for the segmented DM flat file, not None.")
@@ -286,15 +287,26 @@ class SegmentedDmCommand(object):
     def to_command(self):
         """ Output command suitable (in the form a dictionary with an entry for each segment)
         for sending to the hardware driver. The custom flat map will be added only at this stage.
+        The flat map file is cached and only re-read if filename_flat or the file's mtime changes.
         """
         if self.apply_flat_map:
-            command_data = self.add_map(self.filename_flat, return_new_map=True)
+            command_data = self.add_map(self._get_flat_map_data(), return_new_map=True)
         else:
             command_data = self.data
         command_dict = dict(zip(self.segments_in_pupil, command_data))
 
         return command_dict
 
+    def _get_flat_map_data(self):
+        """ Read and return the custom flat map from self.filename_flat as a list of tuples for each commanded
+        segment. The file is only read upon first use, and again only if self.filename_flat is changed or the file is
+        modified (as per its mtime).
+        """
+        key = (self.filename_flat, os.path.getmtime(self.filename_flat))
+        if self._flat_map_cache is None or self._flat_map_cache[0] != key:
+            self._flat_map_cache = (key, self._read_command(self.filename_flat))
+        return self._flat_map_cache[1]
+
     def update_one_segment(self, segment_ind, ptt_tuple, add_to_current=True):
         """ Update the value of one segment by supplying the new command that will be added
         to or will replace the current PTT tuple on this segment only. To identify the segment to be changed, give
@@ -307,12 +319,29 @@ class SegmentedDmCommand(object):
         :param ptt_tuple: tuple with three values for piston, tip, and tilt in um and mrad unless specified otherwise
                           with self.dm_command_units
         """
+        self.update_segments([segment_ind], [ptt_tuple], add_to_current=add_to_current)
+
+    def update_segments(self, segment_inds, ptt_tuples, add_to_current=True):
+        """ Update the values of several segments at once. This is the bulk equivalent of update_one_segment(), where
+        all updates are applied in a single pass rather than one per segment.
+
+        :param segment_inds: iterable of ints, for the segments in the pupil that are to be updated,
+                             provide the indices of their locations in the active segment list
+        :param ptt_tuples: iterable of tuples with three values for piston, tip, and tilt in um and mrad unless
+                           specified otherwise with self.dm_command_units, one for each index in segment_inds
+        :param add_to_current: bool, if True, add the given values to the current ones, otherwise replace them
+
+        As with repeated calls to update_one_segment(), should a segment index be repeated, its values are summed
+        when add_to_current=True, otherwise the last one given is used.
+        """
         if add_to_current:
             command_list = util.create_zero_list(self.aperture.number_segments_in_pupil)
-            command_list[segment_ind] = ptt_tuple
+            for segment_ind, ptt_tuple in zip(segment_inds, ptt_tuples):
+                command_list[segment_ind] = tuple(map(sum, zip(command_list[segment_ind], ptt_tuple)))
             self.add_map(command_list)
         else:
-            self.data[segment_ind] = ptt_tuple
+            for segment_ind, ptt_tuple in zip(segment_inds, ptt_tuples):
+                self.data[segment_ind] = tuple(ptt_tuple)
 
     def add_map(self, segment_values_to_add, return_new_map=False):
         """
@@ -489,8 +518,9 @@ def round_ptt_list(ptt_list, decimals=3):
     :return: list of coefficients for piston, tip, and tilt, for your pupil rounded to
              the specified number of decimal places
     """
-    return [(np.round(ptt[0], decimals), np.round(ptt[1], decimals),
-             np.round(ptt[2], decimals)) for ptt in ptt_list]
+    # Round all values in one vectorized call, rather than per value, and convert back to tuples of Python floats.
+    rounded = np.round(np.asarray(ptt_list, dtype=float), decimals)
+    return [tuple(ptt) for ptt in rounded.tolist()]
 
 
 def convert_ptt_units(ptt_list, tip_factor, tilt_factor, starting_units, ending_units):
@@ -526,9 +556,14 @@ def convert_ptt_units(ptt_list, tip_factor, tilt_factor, starting_units, ending_
     :return: list of tuples of the piston, tip, tilt values for each segment listed,
              in the respective ending_units
     """
-    converted = [(ptt[0]*(starting_units[0]).to(ending_units[0]),
-                  tip_factor*ptt[2]*(starting_units[2]).to(ending_units[2]),
-                  tilt_factor*ptt[1]*(starting_units[1]).to(ending_units[1])) for ptt in ptt_list]
+    # The unit conversions are the same for every segment, so compute the (float) factors once up front.
+    piston_conversion = (starting_units[0]).to(ending_units[0])
+    tip_conversion = (starting_units[1]).to(ending_units[1])
+    tilt_conversion = (starting_units[2]).to(ending_units[2])
+
+    converted = [(ptt[0]*piston_conversion,
+                  tip_factor*ptt[2]*tilt_conversion,
+                  tilt_factor*ptt[1]*tip_conversion) for ptt in ptt_list]
     return converted
 
 
@@ -609,11 +644,6 @@ class PoppySegmentedDmCommand(SegmentedDmCommand):
         self.radius = (self.aperture.flat_to_flat/2).to(u.m)
         self.num_terms = (self.aperture.number_segments_in_pupil) * 3
 
-        # Grab the units of the DM for the piston, tip, tilt values to convert to
-        dm_command_units = CONFIG_INI.get(self.dm_config_id, 'dm_ptt_units').split(',')
-        self.dm_command_units = [u.Unit(dm_command_units[0]), u.Unit(dm_command_units[1]),
-                                 u.Unit(dm_command_units[2])]
-
         self.global_coefficients = global_coefficients
 
         # Create the specific basis for this pupil
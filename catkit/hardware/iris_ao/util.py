@@ -94,19 +94,21 @@ def write_ini(data, path, dm_config_id, mirror_serial=None, driver_serial=None):
     config = ConfigParser()
     config.optionxform = str   # keep capital letters
 
+    num_segments = iris_num_segments(dm_config_id)
+
     config.add_section('Param')
-    config.set('Param', 'nbSegment', str(iris_num_segments(dm_config_id)))
+    config.set('Param', 'nbSegment', str(num_segments))
 
     config.add_section('SerialNb')
     config.set('SerialNb', 'mirrorSerial', mirror_serial)
     config.set('SerialNb', 'driverSerial', driver_serial)
 
-    for i in range(1, iris_num_segments(dm_config_id)+1):
+    for i in range(1, num_segments+1):
         section = 'Segment{}'.format(i)
         config.add_section(section)
+        ptt = data.get(i)
         # If the segment number is present in the dictionary
-        if i in list(data.keys()):
-            ptt = data.get(i)
+        if ptt is not None:
             config.set(section, 'z', str(np.round(ptt[0], decimals=3)))
             config.set(section, 'xrad', str(np.round(ptt[1], decimals=3)))
             config.set(section, 'yrad', str(np.round(ptt[2], decimals=3)))
@@ -6,11 +6,11 @@ Connects to the controller via usb using pvisa and FTDI drivers.
 
 import enum
 import functools
-import math
 import os
 import struct
 import time
 
+import numpy as np
 import pyvisa
 
 from catkit.interfaces.ClosedLoopController import ClosedLoopController
@@ -53,6 +53,10 @@ class NPointLC400(ClosedLoopController):
     channel_address_offset = 0x1000
     channels = (1, 2)
     endian = '<'  # Little endian.
+    # Precompiled (un)packers for the two supported data types, 'I' := 32b unsigned int & 'd' := 64b float.
+    structs = {'I': struct.Struct(endian + 'I'), 'd': struct.Struct(endian + 'd')}
+    # Accepted parameter value types, including numpy scalars, e.g., np.float32, which don't subclass float.
+    value_types = (int, float, np.integer, np.floating)
 
     def initialize(self, com_id, timeout=5):
         """Initial function to set vendor and product id parameters.
@@ -69,12 +73,15 @@ class NPointLC400(ClosedLoopController):
         self.timeout = timeout
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def build_address(cls, parameter, channel):
         """ Builds the address to send to the controller.
         Memory offsets are summed with a channel base address to set the parameter for a specific channel.
         Channels are separated by an offset of 0x1000.
         0x11831000 := Ch1 base address
         0x11832000 := Ch2 base address
+
+        There are only len(Parameters) * len(channels) valid addresses, so they're cached upon first use.
         """
 
         if parameter not in Parameters:
@@ -86,13 +93,17 @@ class NPointLC400(ClosedLoopController):
         # + := int addition.
         address = cls.base_channel_address + channel*cls.channel_address_offset + parameter.hex_code
 
-        return struct.pack(cls.endian + 'I', address)  # 'I' := unsigned int.
+        return cls.structs['I'].pack(address)  # 'I' := unsigned int.
 
     def _close(self):
-        # Reset everything to 0.
+        # Reset everything to 0, sending all SET messages in a single write. Unlike set_and_check(), no read-back
+        # is performed, as is the case for set().
+        messages = []
         for channel in self.channels:
             for parameter in Parameters:
-                self.set(parameter, channel, 0)
+                messages.extend(self._build_set_message(parameter, channel, 0))
+        self._send(messages)
+        self.log.info("All parameters on all channels reset to 0.")
         self.instrument.close()
 
     def _open(self):
@@ -105,16 +116,19 @@ class NPointLC400(ClosedLoopController):
 
     def _read(self, byte_count):
         """ Read a response from controller. """
-        start = time.time()
+        start = time.perf_counter()
         resp = self.instrument.read_bytes(byte_count)
-        self.log.debug(f'It took {start - time.time()}s to read response.')
+        # Let logging do the formatting so that nothing is built per read unless debug logging is enabled.
+        self.log.debug('It took %ss to read response.', time.perf_counter() - start)
         return resp
 
     def _send(self, message):
-        """ Send the message(s) to the controller. """
-        message = message if isinstance(message, (tuple, list)) else [message]
-        for msg in message:
-            self.instrument.write_raw(msg)
+        """ Send the message(s) to the controller.
+        Multiple messages are concatenated and sent with a single write. Each message is self-delimiting (its length
+        is determined by its command byte) so the controller receives exactly the same byte stream.
+        """
+        message = b''.join(message) if isinstance(message, (tuple, list)) else message
+        self.instrument.write_raw(message)
 
     def get(self, parameter, channel):
         """
@@ -130,26 +144,36 @@ class NPointLC400(ClosedLoopController):
             Number of bytes read: 6 + numReads*4
             Return Value: 0xA4 [addr] [data 1].....[data N] 0x55
         """
-        # Construct message.
-        address = self.build_address(parameter, channel)
+        # Send GET.
+        self._send(self._build_get_message(parameter, channel))
+
+        # Read response.
+        return self._read_get_response(parameter, channel)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _build_get_message(cls, parameter, channel):
+        """ Construct the GET message for a parameter on a channel. See get().
+        GET messages contain no value so are fixed per parameter & channel and are cached upon first use.
+        """
+        address = cls.build_address(parameter, channel)
         n_reads = parameter.data_length
         if n_reads == 1:
-            message = b''.join([Commands.GET_SINGLE.value, address, self.endpoint])
+            return b''.join([Commands.GET_SINGLE.value, address, cls.endpoint])
         else:
-            n_reads_message = struct.pack(self.endian + 'I', n_reads)
-            message = b''.join([Commands.GET_ARRAY.value, address, n_reads_message, self.endpoint])
-
-        # Send GET.
-        self._send(message)
+            n_reads_message = cls.structs['I'].pack(n_reads)
+            return b''.join([Commands.GET_ARRAY.value, address, n_reads_message, cls.endpoint])
 
-        # Read response.
-        bytes_to_read = 1 + 4 + n_reads*4 + 1  # command + address + n_reads*data + endpoint.
+    def _read_get_response(self, parameter, channel):
+        """ Read, parse, and validate the response to a GET message sent for a parameter on a channel. See get(). """
+        bytes_to_read = 1 + 4 + parameter.data_length*4 + 1  # command + address + n_reads*data + endpoint.
         resp = self._read(bytes_to_read)
 
         # Parse response.
         resp_command, resp_parameter, resp_address, resp_channel, value = self.parse_message(resp)
 
         # Check to ensure that reads are in sync.
+        address = self.build_address(parameter, channel)
         if resp_command not in (Commands.GET_SINGLE, Commands.GET_ARRAY):
             raise RuntimeError(f"Reads and writes out of sync. Expected GET Command but got '{resp_command}")
         if resp_parameter is not parameter:
@@ -173,23 +197,37 @@ class NPointLC400(ClosedLoopController):
             Format: 0xA3 [data] 0x55
             Return Value: none
         """
-        if not isinstance(value, (int, float)):
+        self._send(self._build_set_message(parameter, channel, value))
+
+    def _build_set_message(self, parameter, channel, value):
+        """ Construct the SET message(s) for a parameter on a channel. See set().
+        Returns a list of messages, as 64b values are sent in two halves.
+        """
+        if not isinstance(value, self.value_types):
             raise TypeError(f"Parameter values must be int or float not {type(value)}")
 
-        address = self.build_address(parameter, channel)
+        set_prefix = self._build_set_prefix(parameter, channel)
 
         data_type_fmt = parameter.data_type_fmt
         if data_type_fmt == 'I':
-            value = struct.pack(self.endian + data_type_fmt, 1 if value else 0)
-            self._send(b''.join([Commands.SET.value, address, value, self.endpoint]))
+            value = self.structs[data_type_fmt].pack(1 if value else 0)
+            return [set_prefix + value + self.endpoint]
         elif data_type_fmt == 'd':
-            value = struct.pack(self.endian + data_type_fmt, float(value))
+            value = self.structs[data_type_fmt].pack(float(value))
             # Send value in two halves.
-            self._send([b''.join([Commands.SET.value, address, value[:4], self.endpoint]),
-                        b''.join([Commands.SECOND_MSG.value, value[4:], self.endpoint])])
+            return [set_prefix + value[:4] + self.endpoint,
+                    Commands.SECOND_MSG.value + value[4:] + self.endpoint]
         else:
             raise NotImplementedError("Supports only 32b ints and 64b floats.")
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _build_set_prefix(cls, parameter, channel):
+        """ Construct the fixed part of the SET message for a parameter on a channel, i.e., 0xA2 [addr].
+        Only the data differs between SET messages, so this is cached upon first use.
+        """
+        return Commands.SET.value + cls.build_address(parameter, channel)
+
     def set_and_check(self, parameter, channel, value):
         self.set(parameter, channel, value)
         set_value = self.get(parameter, channel)
@@ -198,10 +236,21 @@ class NPointLC400(ClosedLoopController):
         self.log.debug(f'Command successful: {value} == {set_value}.')
         
     def get_status(self, channel):
-        """ Get the value of all parameter: loop, and p/i/d_gain for the specified channel. Returns a dict. """
+        """ Get the value of all parameter: loop, and p/i/d_gain for the specified channel. Returns a dict.
+        All GET messages are sent in one write and the responses are then read back, expecting them in the same order.
+        This pays the write/read turnaround once rather than once per parameter.
+        NOTE: That the controller answers pipelined requests in the order they were sent is assumed (responses are
+        validated against their requests) but has not been verified on hardware nor confirmed by the LC400 docs.
+        """
+        self._send([self._build_get_message(parameter, channel) for parameter in Parameters])
         value_dict = {}
-        for parameter in Parameters:
-            value_dict[parameter] = self.get(parameter, channel)
+        try:
+            for parameter in Parameters:
+                value_dict[parameter] = self._read_get_response(parameter, channel)
+        except Exception:
+            # Discard any remaining responses such that subsequent reads aren't out of sync.
+            self.instrument.flush(pyvisa.constants.BufferOperation.discard_read_buffer)
+            raise
         self.log.info(f"Status: {value_dict}")
         return value_dict 
 
@@ -251,25 +300,25 @@ class NPointLC400(ClosedLoopController):
             # Parse address
             address = message[1:5]
 
-            # Parse channel
-            int_address = struct.unpack(cls.endian + 'I', address)[0]
-            channel = math.floor((int_address - cls.base_channel_address) / cls.channel_address_offset)
+            # Parse channel and parameter offset in one integer division.
+            int_address = cls.structs['I'].unpack(address)[0]
+            channel, parameter_offset = divmod(int_address - cls.base_channel_address, cls.channel_address_offset)
             if channel not in cls.channels:
                 raise ValueError(f"Channel out of bounds. Received '{channel}' expected one of ({cls.channels})")
 
             # Parse parameter
             try:
-                parameter = Parameters(int_address - cls.base_channel_address - cls.channel_address_offset * channel)
+                parameter = Parameters(parameter_offset)
             except ValueError as error:
                 raise NotImplementedError('Non implemented parameter found in message.') from error
 
         # Parse value.
         if command in (Commands.SET, Commands.SECOND_MSG):
-            data = struct.unpack(cls.endian + 'I', message[-5:-1])[0]
+            data = cls.structs['I'].unpack(message[-5:-1])[0]
         elif command is Commands.GET_SINGLE:
             # 0xA0 [addr] 0x55
             # 0xA0 [addr] [data] 0x55
-            data = struct.unpack(cls.endian + parameter.data_type_fmt, message[5:-1])[0] if len(message) > 6 else None
+            data = cls.structs[parameter.data_type_fmt].unpack(message[5:-1])[0] if len(message) > 6 else None
         elif command is Commands.GET_ARRAY:
             # For GET, message could be either that sent or that received. E.g., one of the following:
             # 0xA4 [addr] [numReads] 0x55
@@ -282,7 +331,7 @@ class NPointLC400(ClosedLoopController):
                 data_type_fmt = 'd'
             else:
                 raise NotImplementedError(f"Supports only 32b ints and 64b floats. Received {n_data * 32}b data block.")
-            data = struct.unpack(cls.endian + data_type_fmt, data_block)[0]
+            data = cls.structs[data_type_fmt].unpack(data_block)[0]
         else:
             raise NotImplementedError('Non implemented command found in message.')
 
@@ -0,0 +1,63 @@
+import configparser
+import pickle
+
+import pytest
+
+from catkit.catkit_types import ImageCentering, LyotStopPosition, Pointer
+
+
+class Dummy:
+    def __init__(self, value):
+        self.value = value
+
+    def get_value(self):
+        return self.value
+
+
+def test_pointer_forwarding():
+    pointer = Pointer(Dummy(1))
+    assert pointer.value == 1
+    assert pointer.get_value() == 1
+
+    pointer.value = 2
+    assert pointer.self.value == 2
+
+    del pointer.value
+    with pytest.raises(AttributeError):
+        pointer.value
+
+
+def test_pointer_point_to():
+    pointer = Pointer(None)
+    config = configparser.ConfigParser()
+    config.read_string("[section]\noption = 3")
+
+    pointer.point_to(config)
+    assert pointer.self is config
+    assert pointer.getint("section", "option") == 3
+    assert "sections" in dir(pointer)
+
+
+def test_pointer_pickle():
+    pointer = pickle.loads(pickle.dumps(Pointer(Dummy(1))))
+    assert type(pointer) is Pointer
+    assert pointer.value == 1
+
+
+def test_pointer_class_forwarding():
+    config = configparser.ConfigParser()
+    pointer = Pointer(config)
+    assert isinstance(pointer, configparser.ConfigParser)
+    assert pointer.__class__ is configparser.ConfigParser
+    assert pointer.__doc__ == configparser.ConfigParser.__doc__
+    assert Pointer.__doc__ != configparser.ConfigParser.__doc__
+
+
+def test_enums():
+    assert LyotStopPosition(2) is LyotStopPosition.OUT_OF_BEAM
+    assert ImageCentering.psf.value == 3
+    assert str(ImageCentering.auto) == "ImageCentering.auto"
+    assert f"{LyotStopPosition.IN_BEAM}" == "LyotStopPosition.IN_BEAM"
+    # Members of unrelated enums don't collide.
+    assert ImageCentering.off != LyotStopPosition.IN_BEAM
+    assert len({ImageCentering.off, LyotStopPosition.IN_BEAM}) == 2
@@ -7,12 +7,45 @@ import pytest
 from astropy.io import fits
 
 import catkit.util
+from catkit.catkit_types import MetaDataEntry
 
 
 def test_simualtion_conftest():
     assert catkit.util.simulation
 
 
+def test_safe_divide():
+    assert np.array_equal(catkit.util.safe_divide([-1, 0, 1], 0), [0, 0, 0])
+    assert np.array_equal(catkit.util.safe_divide(np.array([2., 4., 6.]), np.array([2., 0., 3.])), [1, 0, 2])
+    assert np.array_equal(catkit.util.safe_divide(np.ones((2, 2)), np.array([0, 4])), [[0, 0.25], [0, 0.25]])
+    assert catkit.util.safe_divide(np.array([1, 2], dtype=np.float32), np.float32(2)).dtype == np.float32
+    assert catkit.util.safe_divide(1, 0) == 0
+    assert catkit.util.safe_divide(3, 2) == 1.5
+    # Non-finite results are set to 0.
+    assert np.array_equal(catkit.util.safe_divide(np.array([np.nan, 1, np.inf, 1e308]), np.array([1, np.nan, 1, 1e-308])),
+                          [0, 0, 0, 0])
+    assert catkit.util.safe_divide(np.inf, 2) == 0
+
+
+def test_write_fits_repeated_metadata(tmpdir):
+    metadata = [MetaDataEntry("dup", "DUP", 1, "first"),
+                MetaDataEntry("other", "OTHER", 0, "other"),
+                MetaDataEntry("dup", "DUP", 2, "second")]
+    filepath = catkit.util.write_fits(np.zeros((2, 2)), os.path.join(tmpdir, "dummy"), metadata=metadata)
+    header = fits.getheader(filepath)
+    assert header.count("DUP") == 1
+    assert header["DUP"] == 2
+    assert header.comments["DUP"] == "second"
+
+
+def test_write_fits_verifies_caller_header(tmpdir):
+    # A header without a SIMPLE card isn't valid for a primary HDU.
+    header = fits.Header()
+    header["FOO"] = 1
+    with pytest.raises(fits.VerifyError):
+        catkit.util.write_fits(np.zeros((2, 2)), os.path.join(tmpdir, "dummy"), header=header)
+
+
 class TestSaveImages:
 
     def test_empty_image_list(self, tmpdir):
@@ -1,3 +1,4 @@
+import functools
 import importlib
 import os
 import logging
@@ -7,10 +8,11 @@ import time
 from catkit.catkit_types import MetaDataEntry
 
 import numpy as np
-from astropy.io import fits
 
 from catkit.catkit_types import quantity
 
+# astropy.io.fits is slow to import so is imported only within the functions that use it.
+
 
 simulation = False
 
@@ -29,21 +31,30 @@ def find_repo_location(package='catkit'):
     return os.path.abspath(os.path.join(find_package_location(package), os.pardir))
 
 
+@functools.lru_cache(maxsize=1)
 def get_dm_mask():
-    if not hasattr(get_dm_mask, 'mask'):
-        mask_path = os.path.join(find_package_location("catkit"), "hardware", "boston", "kiloCdm_2Dmask.fits")
-        get_dm_mask.mask = fits.getdata(mask_path)
+    """ Get the Boston kilo DM mask. This is read from disk once and cached.
+    The returned array is shared by all callers and is therefore read-only, copy it if it needs to be modified.
+    """
+    from astropy.io import fits
 
-    return get_dm_mask.mask
+    mask_path = os.path.join(find_package_location("catkit"), "hardware", "boston", "kiloCdm_2Dmask.fits")
+    mask = fits.getdata(mask_path)
+    mask.flags.writeable = False
+    return mask
 
 
 # Does numpy gotchu?
 def safe_divide(a, b):
-    """ ignore / 0, div0( [-1, 0, 1], 0 ) -> [0, 0, 0] """
-    with np.errstate(divide='ignore', invalid='ignore'):
-        c = np.true_divide(a, b)
-        c[~ np.isfinite(c)] = 0  # -inf inf NaN
-    return c
+    """ ignore / 0, div0( [-1, 0, 1], 0 ) -> [0, 0, 0]
+    Any non-finite result (-inf, inf, NaN) is set to 0. Also accepts scalars and array-likes.
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        c = np.asarray(np.true_divide(a, b))  # 0-d input yields a scalar, so re-wrap such that it can be assigned to.
+    c[~ np.isfinite(c)] = 0  # -inf inf NaN
+    return c if c.ndim else c[()]
 
 
 def write_fits(data, filepath, header=None, metadata=None):
@@ -55,13 +66,16 @@ def write_fits(data, filepath, header=None, metadata=None):
     :param metadata: list of MetaDataEntry objects that will get added to header.
     :return: filepath
     """
+    from astropy.io import fits
+
     log = logging.getLogger()
     # Make sure file ends with fit or fits.
     if not (filepath.endswith(".fit") or filepath.endswith(".fits")):
         filepath += ".fits"
 
-    if not os.path.exists(os.path.dirname(filepath)):
-        os.makedirs(os.path.dirname(filepath))
+    dirname = os.path.dirname(filepath)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
 
     # Create a PrimaryHDU object to encapsulate the data.
     hdu = fits.PrimaryHDU(data)
@@ -70,18 +84,31 @@ def write_fits(data, filepath, header=None, metadata=None):
 
     # Add metadata to header.
     if metadata is not None:
+        cards = []
+        long_keywords = []
+        long_comments = []
         for entry in metadata:
-            if len(entry.name_8chars) > 8:
-                log.warning("Fits Header Keyword: " + entry.name_8chars +
-                      " is greater than 8 characters and will be truncated.")
-            if len(entry.comment) > 47:
-                log.warning("Fits Header comment for " + entry.name_8chars +
-                      " is greater than 47 characters and will be truncated.")
-            hdu.header[entry.name_8chars[:8]] = (entry.value, entry.comment)
-
-    # Create a HDUList to contain the newly created primary HDU, and write to a new file.
-    fits.HDUList([hdu])
-    hdu.writeto(filepath, overwrite=True)
+            keyword = entry.name_8chars
+            comment = entry.comment
+            if len(keyword) > 8:
+                long_keywords.append(keyword)
+            if len(comment) > 47:
+                long_comments.append(keyword)
+            cards.append((keyword[:8], entry.value, comment))
+
+        if long_keywords:
+            log.warning(f"Fits Header Keywords: {long_keywords} are greater than 8 characters and will be truncated.")
+        if long_comments:
+            log.warning(f"Fits Header comments for {long_comments} are greater than 47 characters and will be truncated.")
+
+        # Add all cards at once. As per ``header[key] = value``, keywords already present, including those repeated
+        # within metadata, are updated in place such that the last value wins.
+        hdu.header.update(cards)
+
+    # Write to a new file. Only a header built entirely here is known to be well-formed, so only then skip the full
+    # verification pass. Anything caller supplied is verified as per the default.
+    output_verify = "ignore" if header is None and metadata is None else "exception"
+    hdu.writeto(filepath, overwrite=True, output_verify=output_verify, checksum=False)
 
     log.info("Wrote " + filepath)
     return filepath
@@ -93,7 +120,8 @@ def rotate_and_flip_image(data, theta, flip):
     :param data: Numpy array of image data.
     :param theta: Rotation in degrees of the mounted camera, only these discrete values {0, 90, 180, 270}
     :param flip: Boolean for whether to flip the data using np.fliplr.
-    :return: Converted numpy array.
+    :return: Converted numpy array. Both np.rot90 and np.fliplr return views so this is a view of data, no pixels are
+             copied. Copy it if data will be modified and the original orientation is still needed.
     """
     data_corr = np.rot90(data, int(theta / 90))
 
@@ -110,6 +138,7 @@ def save_images(images, meta_data, path, base_filename, raw_skip=0):
     :param base_filename: Name for file.
     :return: None
     """
+    from astropy.io import fits
 
     if not isinstance(images, (list, tuple)):
         images = [images]
@@ -137,8 +166,7 @@ def save_images(images, meta_data, path, base_filename, raw_skip=0):
     file_root, file_ext = os.path.splitext(filename)
 
     # Create directory if it doesn't exist.
-    if not os.path.exists(path):
-        os.makedirs(path)
+    os.makedirs(path, exist_ok=True)
 
     num_exposures = len(images)
 
@@ -224,9 +252,11 @@ def soft_kill(process):
         try:
             log.info("Sending ctrl-c event...")
             raise_signal(signum)
+            # Block on the process rather than polling it, join() returns as soon as it exits.
+            process.join(timeout=1)
             while process.is_alive():
                 log.info("Child process is still alive...")
-                sleep(1)
+                process.join(timeout=1)
             log.info("Child process softly killed.")
         except KeyboardInterrupt:
             log.exception("Main process: caught ctrl-c")
@@ -234,9 +264,11 @@ def soft_kill(process):
         try:
             log.info("Sending ctrl-c event...")
             raise_signal(signum)
+            # Block on the process rather than polling it, join() returns as soon as it exits.
+            process.join(timeout=1)
             while process.is_alive():
                 log.info("Child process is still alive...")
-                sleep(1)
+                process.join(timeout=1)
             log.info("Child process softly killed.")
         except KeyboardInterrupt:
             log.exception("Main process: caught ctrl-c")